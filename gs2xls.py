@@ -8,24 +8,65 @@
 # Cells are formatted with:
 # - Dark blue font for 'N/A' values
 # - Light blue background for cells containing descriptive metadata or status indicators
+# Interpreter note:
+# - On CPython the workbook is streamed with openpyxl's write-only mode, which is the fastest option
+# - On PyPy write-only mode is roughly 10x slower, so the regular mode is used there; CPython is recommended
 
 
 import openpyxl
 from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill
 from datetime import datetime
 from geoserver.catalog import Catalog
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
+import asyncio
+import platform
+from operator import itemgetter
+from importlib.util import find_spec
+
+try:
+    import httpx  # Optional: fetch layer styles asynchronously over HTTP/2
+except ImportError:
+    httpx = None
+
+if find_spec("h2") is None:
+    httpx = None  # httpx needs the h2 package for HTTP/2, which is not installed with plain httpx
+
+try:
+    import orjson  # Optional: faster parsing of GeoServer JSON responses
+except ImportError:
+    orjson = None
 
 # GeoServer connection parameters
 geoserver_url = "https://your-geoserver-url/geoserver/rest"  # Replace with your GeoServer URL
 username = "your_username"  # Replace with your username
 password = "your_password"  # Replace with your password
 
+# Number of parallel REST requests (keep it modest to avoid throttling GeoServer)
+max_workers = 8
+
+# Shared HTTP session: keeps connections alive and pools them across REST calls and worker threads
+session = requests.Session()
+session.auth = (username, password)
+adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=3, backoff_factor=0.3))
+session.mount('https://', adapter)
+session.mount('http://', adapter)
+
+# Use openpyxl's write-only mode on CPython only (it is much slower than the regular mode on PyPy)
+write_only = platform.python_implementation() != 'PyPy'
+
+# Pattern for EPSG codes in bounding boxes
+epsg_pattern = re.compile(r'EPSG:\d+')
+
 # Styling for cells
 dark_blue_font = Font(color='00008B')
+hyperlink_font = Font(color='0563C1', underline='single')  # Same look as the built-in 'Hyperlink' style, without the named style lookup
 light_blue_fill = PatternFill(start_color='ADD8E6', end_color='ADD8E6', fill_type='solid')  # Light blue fill
 
 # Connect to the GeoServer catalog using gsconfig
@@ -52,42 +93,69 @@ def fetch_store_details():
             'store_name': store.name,
             'store_url': store_url
         })
-    stores = sorted(stores, key=lambda x: (x['workspace_name'], x['store_name']))  # Sorting by Workspace and Store
+    stores = sorted(stores, key=itemgetter('workspace_name', 'store_name'))  # Sorting by Workspace and Store
     print("Store details fetched and sorted.")
     return stores
 
-def fetch_default_style(layer_name):
-    """Fetch the default style for a given layer using the GeoServer REST API."""
+def fetch_layer_styles(layer_name):
+    """Fetch the default style and available styles for a given layer with a single GeoServer REST API call."""
     layer_url = f"{geoserver_url}/layers/{layer_name}.json"
-    response = requests.get(layer_url, auth=(username, password))
+    try:
+        response = session.get(layer_url)
+    except requests.RequestException as error:
+        return styles_fetch_failed(layer_name, error)
+    return parse_layer_styles(response)
+
+async def fetch_all_layer_styles(layer_names):
+    """Fetch the default style and available styles for all layers concurrently over a single HTTP/2 client."""
+    limits = httpx.Limits(max_connections=max_workers)
+    transport = httpx.AsyncHTTPTransport(http2=True, retries=3, limits=limits)  # Retry failed connections like the shared session
+    semaphore = asyncio.Semaphore(max_workers)  # Same number of requests in flight as the thread pool
     
-    if response.status_code == 200:  # Fixed unmatched ')' issue
-        layer_data = response.json()
-        style_info = layer_data.get("layer", {}).get("defaultStyle", {}).get("name", "N/A")
-        return style_info
-    else:
-        return "N/A"
-
-def fetch_available_styles(layer_name):
-    """Fetch available styles for a given layer from the GeoServer REST API."""
-    layer_url = f"{geoserver_url}/layers/{layer_name}.json"
-    response = requests.get(layer_url, auth=(username, password))
+    async with httpx.AsyncClient(transport=transport, auth=(username, password), timeout=30.0) as client:
+        styles = await asyncio.gather(*(fetch_layer_styles_async(client, semaphore, layer_name) for layer_name in layer_names))
     
-    if response.status_code == 200:
-        layer_data = response.json()
-        
-        # Check if 'styles' is a valid dictionary and contains a 'style' list
-        styles_data = layer_data.get("layer", {}).get("styles", {})
-        
-        if isinstance(styles_data, dict) and "style" in styles_data:
-            available_styles = [style.get('name', 'N/A') for style in styles_data["style"] if isinstance(style, dict)]
-            return ', '.join(available_styles) if available_styles else 'N/A'
-        
-    return "N/A"
+    return dict(zip(layer_names, styles))
+
+async def fetch_layer_styles_async(client, semaphore, layer_name):
+    """Fetch the default style and available styles for a given layer, waiting for a free slot first."""
+    async with semaphore:
+        try:
+            response = await client.get(f"{geoserver_url}/layers/{layer_name}.json")
+        except httpx.HTTPError as error:
+            return styles_fetch_failed(layer_name, error)
+    return parse_layer_styles(response)
+
+def styles_fetch_failed(layer_name, error):
+    """Report a failed style request and fall back to 'N/A' so the other layers are still exported."""
+    print(f"Warning: could not fetch styles for layer {layer_name}: {error}")
+    return "N/A", "N/A"
+
+def parse_layer_styles(response):
+    """Extract the default style and available styles from a GeoServer layer REST API response."""
+    if response.status_code != 200:
+        return "N/A", "N/A"
+    
+    layer_data = parse_json(response).get("layer", {})
+    default_style = layer_data.get("defaultStyle", {}).get("name", "N/A")
+    
+    # Check if 'styles' is a valid dictionary and contains a 'style' list
+    styles_data = layer_data.get("styles", {})
+    available_styles = []
+    if isinstance(styles_data, dict) and "style" in styles_data:
+        available_styles = [style.get('name', 'N/A') for style in styles_data["style"] if isinstance(style, dict)]
+    
+    return default_style, ', '.join(available_styles) if available_styles else 'N/A'
+
+def parse_json(response):
+    """Parse the JSON body of a GeoServer REST API response, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
 
 def extract_epsg_code(bbox):
     """Extract EPSG code from the bounding box."""
-    match = re.search(r'EPSG:\d+', str(bbox))
+    match = epsg_pattern.search(bbox if isinstance(bbox, str) else str(bbox))
     if match:
         return match.group(0)
     return 'N/A'
@@ -102,13 +170,13 @@ def fetch_group_details():
         parent_name = getattr(group, 'name', 'N/A')
         
         # Get all possible layer group attributes
-        bounds = getattr(group, 'bounds', 'N/A')
+        bounds = str(getattr(group, 'bounds', 'N/A'))  # Converted to text once for both the EPSG lookup and the report
         title = getattr(group, 'title', 'N/A')
         mode = getattr(group, 'mode', 'N/A')
         layers = ', '.join([layer.name if hasattr(layer, 'name') else layer for layer in group.layers])
         
         # Extract the EPSG code from bounds
-        crs = extract_epsg_code(str(bounds))
+        crs = extract_epsg_code(bounds)
         
         # Collect group details
         groups.append({
@@ -116,7 +184,7 @@ def fetch_group_details():
             'group_name': parent_name,
             'title': title,
             'crs': crs,
-            'bounds': str(bounds),
+            'bounds': bounds,
             'mode': mode,
             'layers': layers
         })
@@ -128,67 +196,89 @@ def fetch_group_details():
             else:
                 group_to_layers[layer.name] = parent_name
 
-    groups = sorted(groups, key=lambda x: (x['group_name']))  # Sorting by Group
+    groups = sorted(groups, key=itemgetter('group_name'))  # Sorting by Group
     print("Layer group details fetched and sorted.")
     return groups, group_to_layers
 
 def fetch_layer_details(group_to_layers):
     """Fetch detailed information about all layers, including their parent group."""
     layers = []
+    catalog_layers = cat.get_layers()
     
-    for layer in cat.get_layers():
+    layer_names = [layer.name for layer in catalog_layers]
+    
+    # Fetch default style and available styles for all layers in parallel
+    if httpx is not None:
+        layer_styles = asyncio.run(fetch_all_layer_styles(layer_names))
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            layer_styles = dict(zip(layer_names, executor.map(fetch_layer_styles, layer_names)))
+    
+    for layer in catalog_layers:
+        layer_name = layer.name
         resource = layer.resource
-        parent_group = group_to_layers.get(layer.name, 'N/A')  # Get the parent group name if exists
-        bbox = getattr(resource, 'latlon_bbox', 'N/A')  # Bounding box
+        store = resource.store
+        workspace_name = store.workspace.name if store else 'N/A'
+        store_name = store.name if store else 'N/A'
+        parent_group = group_to_layers.get(layer_name, 'N/A')  # Get the parent group name if exists
+        
+        # gsconfig fetches the resource details on first access and raises AttributeError if that fails
+        try:
+            title, abstract, latlon_bbox = resource.title, resource.abstract, resource.latlon_bbox
+        except AttributeError:
+            title = abstract = latlon_bbox = 'N/A'
+        
+        bbox = str(latlon_bbox)  # Bounding box, converted to text once for both the EPSG lookup and the report
         crs = extract_epsg_code(bbox)
         
-        # Fetch default style and available styles for the layer
-        default_style = fetch_default_style(layer.name)
-        available_styles = fetch_available_styles(layer.name)
+        default_style, available_styles = layer_styles[layer_name]
         
         layers.append({
-            'workspace_name': resource.store.workspace.name if resource.store else 'N/A',
-            'store': getattr(resource.store, 'name', 'N/A') if resource.store else 'N/A',
+            'workspace_name': workspace_name,
+            'store': store_name,
             'group_name': parent_group,
-            'name': layer.name,
-            'title': getattr(resource, 'title', 'N/A'),
+            'name': layer_name,
+            'title': title,
             'default_style': default_style,
             'available_styles': available_styles,
             'crs': crs,
             'bbox': bbox,
-            'abstract': getattr(resource, 'abstract', 'N/A')
+            'abstract': abstract
         })
-    layers = sorted(layers, key=lambda x: (x['workspace_name'], x['store'], x['group_name'], x['name']))  # Sorting by Workspace, Store, Group, and Layer Name
+    layers = sorted(layers, key=itemgetter('workspace_name', 'store', 'group_name', 'name'))  # Sorting by Workspace, Store, Group, and Layer Name
     print("Layer details fetched and sorted.")
     return layers
 
 def fetch_styles():
     """Fetch all styles from the GeoServer REST API."""
     styles_url = f"{geoserver_url}/workspaces/cgs/styles.json"
-    response = requests.get(styles_url, auth=(username, password))
+    response = session.get(styles_url)
     
     if response.status_code == 200:
-        styles_data = response.json()
+        styles_data = parse_json(response)
         styles_list = styles_data.get("styles", {}).get("style", [])
         return styles_list
     return []
 
-def create_group_worksheets(wb, groups, layers):
+def create_group_worksheets(wb, groups, layers, lookups):
     """Create worksheets for each layer group and fill them with layer and group details."""
+    layer_by_name = {layer['name']: layer for layer in layers}  # Index layers by name for constant-time lookups
+    layer_group_map = {group['group_name']: group['title'] for group in groups}  # Mapping 'Group Name' to 'Title'
+    
     for group in groups:
         group_name = group['group_name']
         ws = wb.create_sheet(title=f"Group {group_name[:25]}")  # Truncate long names to 25 chars
         ws.sheet_properties.tabColor = "ADD8E6"  # Apply light blue tab color for layer groups
         
         # Add headers to the worksheet
-        ws.append(["Workspace", "Store", "Group", "Group title", "Type", "Layer", "Child title", "Style"])
+        rows = [make_row(ws, ["Workspace", "Store", "Group", "Group title", "Type", "Layer", "Child title", "Style"])]
         
         # Populate rows for the group
         for layer_name in group['layers'].split(', '):
-            matching_layer = next((layer for layer in layers if layer['name'] == layer_name), None)
+            matching_layer = layer_by_name.get(layer_name)
             if matching_layer:
                 # Populate row for each layer in the group
-                ws.append([
+                rows.append(make_row(ws, [
                     matching_layer['workspace_name'],
                     matching_layer['store'],
                     group_name,
@@ -197,10 +287,10 @@ def create_group_worksheets(wb, groups, layers):
                     matching_layer['name'],
                     matching_layer['title'],  # Populate Child title with layer title
                     matching_layer['default_style']
-                ])
+                ]))
             else:
                 # If no matching layer is found, it's assumed to be another group
-                ws.append([
+                rows.append(make_row(ws, [
                     group['workspace_name'],
                     "N/A",
                     group_name,
@@ -209,99 +299,99 @@ def create_group_worksheets(wb, groups, layers):
                     layer_name,
                     "N/A",  # Child title set to N/A if no layer title
                     "N/A"
-                ])
+                ]))
         
         # Populate 'Child title' for Layer Groups by matching Layer and Group Name
-        populate_child_title(wb, ws)
+        populate_child_title(ws, rows, layer_group_map)
 
         # Add header hyperlinks to 'Workspace', 'Store', 'Group', 'Layer', and 'Style' columns
-        add_header_hyperlinks(ws)
+        add_header_hyperlinks(rows[0])
 
         # Link 'Workspace', 'Store', 'Group', 'Layer', and 'Style' columns with their respective sheets
-        link_columns_with_sheets(ws, wb)
+        link_columns_with_sheets(rows, lookups)
 
         # Create hyperlinks where 'Type' is 'Layer Group'
-        add_layer_group_hyperlinks(wb, ws)
+        add_layer_group_hyperlinks(rows, lookups['groups'])
 
-        # Apply the formatting functions to each group worksheet
-        format_worksheet(ws)
-        adjust_column_width(ws)
-        apply_na_color(ws)
+        # Apply the formatting functions and write the rows to the group worksheet
+        write_rows(ws, rows)
         print(f"Worksheet for Group {group_name} created.")
 
-def populate_child_title(wb, ws):
+def populate_child_title(ws, rows, layer_group_map):
     """Populate 'Child title' for rows where 'Type' = 'Layer Group' by matching 'Layer' and 'Group Name'."""
-    layer_groups_ws = wb['Layer Groups']  # Get the Layer Groups worksheet
-    layer_group_map = {row[0]: row[1] for row in layer_groups_ws.iter_rows(min_row=2, values_only=True)}  # Mapping 'Group Name' to 'Title'
-
-    for row in ws.iter_rows(min_row=2):
+    for row in rows[1:]:
         if row[4].value == "Layer Group":  # Check if 'Type' is 'Layer Group'
             layer_name = row[5].value.replace('cgs:', '')  # Remove 'cgs:' prefix
             if layer_name in layer_group_map:
-                row[6].value = layer_group_map[layer_name]  # Populate 'Child title' with the matched 'Title'
+                row[6] = make_cell(ws, layer_group_map[layer_name])  # Populate 'Child title' with the matched 'Title'
 
-def add_layer_group_hyperlinks(wb, ws):
+def add_layer_group_hyperlinks(rows, group_name_map):
     """Add hyperlinks where 'Type' = 'Layer Group' to 'Group Name' by matching the 'Layer' column."""
-    layer_groups_ws = wb['Layer Groups']  # Get the 'Layer Groups' worksheet
-    group_name_map = {row[0]: f"A{idx+2}" for idx, row in enumerate(layer_groups_ws.iter_rows(min_row=2, values_only=True))}  # Map 'Group Name' to row in Layer Groups
-    
-    for row in ws.iter_rows(min_row=2):
+    for row in rows[1:]:
         if row[4].value == "Layer Group":  # Check if 'Type' is 'Layer Group'
             layer_name = row[5].value.replace('cgs:', '')  # Remove 'cgs:' prefix from Layer column
             if layer_name in group_name_map:
-                row[5].hyperlink = f"#'Layer Groups'!{group_name_map[layer_name]}"  # Add hyperlink to the Group Name cell in 'Layer Groups'
-                row[5].style = "Hyperlink"  # Set hyperlink style
+                add_hyperlink(row[5], f"#'Layer Groups'!{group_name_map[layer_name]}")  # Add hyperlink to the Group Name cell in 'Layer Groups'
 
-def add_header_hyperlinks(ws):
+def add_header_hyperlinks(header):
     """Add header hyperlinks to the 'Workspace', 'Store', 'Group', 'Layer', and 'Style' columns."""
-    ws.cell(row=1, column=1).hyperlink = "#'Workspaces'!A1"
-    ws.cell(row=1, column=1).style = "Hyperlink"
+    header[0].hyperlink = "#'Workspaces'!A1"
+    header[0].font = hyperlink_font
     
-    ws.cell(row=1, column=2).hyperlink = "#'Stores'!A1"
-    ws.cell(row=1, column=2).style = "Hyperlink"
+    header[1].hyperlink = "#'Stores'!A1"
+    header[1].font = hyperlink_font
     
-    ws.cell(row=1, column=3).hyperlink = "#'Layer Groups'!A1"
-    ws.cell(row=1, column=3).style = "Hyperlink"
+    header[2].hyperlink = "#'Layer Groups'!A1"
+    header[2].font = hyperlink_font
 
     # Add hyperlink for the 'Layer' header to link to the 'Layers' worksheet
-    ws.cell(row=1, column=6).hyperlink = "#'Layers'!A1"
-    ws.cell(row=1, column=6).style = "Hyperlink"
+    header[5].hyperlink = "#'Layers'!A1"
+    header[5].font = hyperlink_font
 
     # Add hyperlink for the 'Style' header to link to the 'Styles' worksheet
-    ws.cell(row=1, column=8).hyperlink = "#'Styles'!A1"
-    ws.cell(row=1, column=8).style = "Hyperlink"
+    header[7].hyperlink = "#'Styles'!A1"
+    header[7].font = hyperlink_font
 
-def add_header_hyperlinks_layers(ws):
+def add_header_hyperlinks_layers(header):
     """Add header hyperlinks to the 'Workspace', 'Store', 'Group', and 'Default style' columns in the 'Layers' worksheet."""
-    ws.cell(row=1, column=1).hyperlink = "#'Workspaces'!A1"
-    ws.cell(row=1, column=1).style = "Hyperlink"
+    header[0].hyperlink = "#'Workspaces'!A1"
+    header[0].font = hyperlink_font
     
-    ws.cell(row=1, column=2).hyperlink = "#'Stores'!A1"
-    ws.cell(row=1, column=2).style = "Hyperlink"
+    header[1].hyperlink = "#'Stores'!A1"
+    header[1].font = hyperlink_font
     
-    ws.cell(row=1, column=3).hyperlink = "#'Layer Groups'!A1"
-    ws.cell(row=1, column=3).style = "Hyperlink"
+    header[2].hyperlink = "#'Layer Groups'!A1"
+    header[2].font = hyperlink_font
     
     # Add hyperlink for the 'Default style' header to link to the 'Styles' worksheet
-    ws.cell(row=1, column=6).hyperlink = "#'Styles'!A1"
-    ws.cell(row=1, column=6).style = "Hyperlink"
+    header[5].hyperlink = "#'Styles'!A1"
+    header[5].font = hyperlink_font
 
-def add_header_hyperlinks_layer_groups(ws):
+def add_header_hyperlinks_layer_groups(header):
     """Add hyperlink to the 'Layers' header in the 'Layer Groups' worksheet."""
-    ws.cell(row=1, column=6).hyperlink = "#'Layers'!A1"
-    ws.cell(row=1, column=6).style = "Hyperlink"
-
-def link_columns_with_sheets(ws, wb):
+    header[5].hyperlink = "#'Layers'!A1"
+    header[5].font = hyperlink_font
+
+def build_sheet_lookups(workspaces, stores, groups, layers, styles):
+    """Map names to their cell locations in the 'Workspaces', 'Stores', 'Layer Groups', 'Layers', and 'Styles' worksheets."""
+    return {
+        'workspaces': {workspace['name']: f"Workspaces!A{idx+2}" for idx, workspace in enumerate(workspaces)},
+        'stores': {store['store_name']: f"Stores!B{idx+2}" for idx, store in enumerate(stores)},
+        'groups': {group['group_name']: f"A{idx+2}" for idx, group in enumerate(groups)},
+        'layers': {layer['name']: f"Layers!D{idx+2}" for idx, layer in enumerate(layers)},
+        'styles': {style.get("name", "N/A"): f"Styles!A{idx+2}" for idx, style in enumerate(styles)}
+    }
+
+def link_columns_with_sheets(rows, lookups):
     """Add hyperlinks to the 'Workspace', 'Store', 'Group', 'Layer', and 'Style' columns in group worksheets."""
-    # Create lookups
-    workspace_lookup = {row[0]: f"Workspaces!A{idx+2}" for idx, row in enumerate(wb["Workspaces"].iter_rows(min_row=2, values_only=True))}
-    store_lookup = {row[1]: f"Stores!B{idx+2}" for idx, row in enumerate(wb["Stores"].iter_rows(min_row=2, values_only=True))}
-    group_lookup = {row[0]: f"A{idx+2}" for idx, row in enumerate(wb["Layer Groups"].iter_rows(min_row=2, values_only=True))}
-    layer_lookup = {row[3]: f"Layers!D{idx+2}" for idx, row in enumerate(wb["Layers"].iter_rows(min_row=2, values_only=True))}
-    style_lookup = {row[0]: f"Styles!A{idx+2}" for idx, row in enumerate(wb["Styles"].iter_rows(min_row=2, values_only=True))}
+    workspace_lookup = lookups['workspaces']
+    store_lookup = lookups['stores']
+    group_lookup = lookups['groups']
+    layer_lookup = lookups['layers']
+    style_lookup = lookups['styles']
 
     # Apply hyperlinks for each row in the current group worksheet
-    for row in ws.iter_rows(min_row=2):
+    for row in rows[1:]:
         workspace_name = row[0].value
         store_name = row[1].value
         group_name = row[2].value
@@ -310,160 +400,166 @@ def link_columns_with_sheets(ws, wb):
         
         # Add hyperlink to 'Workspace'
         if workspace_name in workspace_lookup:
-            row[0].hyperlink = f"#{workspace_lookup[workspace_name]}"
-            row[0].style = "Hyperlink"
+            add_hyperlink(row[0], f"#{workspace_lookup[workspace_name]}")
         
         # Add hyperlink to 'Store'
         if store_name in store_lookup:
-            row[1].hyperlink = f"#{store_lookup[store_name]}"
-            row[1].style = "Hyperlink"
+            add_hyperlink(row[1], f"#{store_lookup[store_name]}")
         
         # Add hyperlink to 'Group'
         if group_name in group_lookup:
-            row[2].hyperlink = f"#'Layer Groups'!{group_lookup[group_name]}"
-            row[2].style = "Hyperlink"
+            add_hyperlink(row[2], f"#'Layer Groups'!{group_lookup[group_name]}")
         
         # Add hyperlink to 'Layer'
         if layer_name in layer_lookup:
-            row[5].hyperlink = f"#{layer_lookup[layer_name]}"
-            row[5].style = "Hyperlink"
+            add_hyperlink(row[5], f"#{layer_lookup[layer_name]}")
 
         # Add hyperlink to 'Style'
         if style_name in style_lookup:
-            row[7].hyperlink = f"#{style_lookup[style_name]}"
-            row[7].style = "Hyperlink"
-
-def adjust_column_width(sheet):
+            add_hyperlink(row[7], f"#{style_lookup[style_name]}")
+
+def add_hyperlink(cell, hyperlink):
+    """Add a hyperlink to a cell with the hyperlink font, keeping the dark blue font on 'N/A' values."""
+    cell.hyperlink = hyperlink
+    if cell.value != 'N/A':
+        cell.font = hyperlink_font
+
+def make_cell(ws, value, hyperlink=None):
+    """Create a write-only cell with its final styling: an optional hyperlink with the hyperlink font and the dark blue font for 'N/A' values."""
+    cell = WriteOnlyCell(ws, value=value)
+    if value == 'N/A':
+        cell.font = dark_blue_font
+    if hyperlink:
+        add_hyperlink(cell, hyperlink)
+    return cell
+
+def make_row(ws, values):
+    """Wrap a list of values into write-only cells so they can be styled before being appended."""
+    return [make_cell(ws, value) for value in values]
+
+def make_plain_row(ws, values):
+    """Keep a list of values as plain values, wrapping only 'N/A' values into styled cells."""
+    return [make_cell(ws, value) if value == 'N/A' else value for value in values]
+
+def cell_value(cell):
+    """Return the value of a cell, or the item itself for rows appended as plain values."""
+    return cell.value if isinstance(cell, Cell) else cell
+
+def adjust_column_width(sheet, rows):
     """Adjust the column widths based on the maximum length of the data in each column, but limit to 50."""
-    for col in sheet.columns:
-        max_length = 0
-        column = col[0].column_letter  # Get the column letter
+    col_widths = [0] * len(rows[0])
 
-        for cell in col:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(cell.value)
-            except:
-                pass
+    # Track the widest value per column in a single row-wise pass
+    for row in rows:
+        for idx, cell in enumerate(row):
+            value = cell_value(cell)
+            if value is not None:
+                col_widths[idx] = max(col_widths[idx], len(str(value)))
 
-        adjusted_width = min(max_length + 2, 50)  # Limit to 50
-        sheet.column_dimensions[column].width = adjusted_width
+    for idx, max_length in enumerate(col_widths, start=1):
+        sheet.column_dimensions[get_column_letter(idx)].width = min(max_length + 2, 50)  # Limit to 50
 
-def format_worksheet(sheet):
+def format_worksheet(sheet, rows):
     """Freeze the first row, add filters to all columns, and set zoom to 125%."""
     sheet.freeze_panes = "A2"  # Freeze the first row
-    sheet.auto_filter.ref = sheet.dimensions  # Set the auto-filter
+    sheet.auto_filter.ref = f"A1:{get_column_letter(len(rows[0]))}{len(rows)}"  # Set the auto-filter
     sheet.sheet_view.zoomScale = 125  # Set zoom to 125%
 
-def apply_na_color(sheet):
-    """Apply dark blue font color to all 'N/A' values in the worksheet."""
-    for row in sheet.iter_rows():
-        for cell in row:
-            if cell.value == 'N/A':
-                cell.font = dark_blue_font
+def write_rows(sheet, rows):
+    """Format the worksheet and append the rows to it (write-only sheets must be set up before the first row)."""
+    format_worksheet(sheet, rows)
+    adjust_column_width(sheet, rows)
+    for row in rows:
+        sheet.append(row)
+        if not write_only:
+            # Regular worksheets keep the hyperlink reference from when the cell was created, so point it at the final position
+            for cell in row:
+                if isinstance(cell, Cell) and cell.hyperlink is not None:
+                    cell.hyperlink.ref = cell.coordinate
 
 def write_to_excel(workspaces, stores, groups, layers, styles, output_file):
-    wb = Workbook()
+    wb = Workbook(write_only=write_only)
+    if not write_only:
+        wb.remove(wb.active)  # Drop the default sheet so the worksheets below keep their order
+
+    # Build the hyperlink lookups once for all worksheets
+    lookups = build_sheet_lookups(workspaces, stores, groups, layers, styles)
 
     # Workspaces sheet
-    ws_workspaces = wb.active
-    ws_workspaces.title = "Workspaces"
-    ws_workspaces.append(["Workspace Name", "HREF"])
+    ws_workspaces = wb.create_sheet(title="Workspaces")
+    rows = [make_row(ws_workspaces, ["Workspace Name", "HREF"])]
     for workspace in workspaces:
-        ws_workspaces.append([workspace['name'], workspace['href']])
-    format_worksheet(ws_workspaces)
-    adjust_column_width(ws_workspaces)
-    apply_na_color(ws_workspaces)
+        rows.append(make_row(ws_workspaces, [workspace['name'], workspace['href']]))
+    write_rows(ws_workspaces, rows)
     print("Workspaces worksheet completed.")
 
     # Stores sheet (added second after 'Workspaces')
     ws_stores = wb.create_sheet(title="Stores", index=1)
-    ws_stores.append(["Workspace Name", "Store Name", "Store URL"])
+    rows = [make_row(ws_stores, ["Workspace Name", "Store Name", "Store URL"])]
     
     # Fetch the link locations from the Workspaces sheet
-    workspace_lookup = {workspace['name']: f"Workspaces!A{idx+2}" for idx, workspace in enumerate(workspaces)}
+    workspace_lookup = lookups['workspaces']
     
     for store in stores:
-        ws_stores.append([store['workspace_name'], store['store_name'], store['store_url']])
         # Create a hyperlink to the Workspaces worksheet for the Workspace Name
-        if store['workspace_name'] in workspace_lookup:
-            link_cell = ws_stores.cell(row=ws_stores.max_row, column=1)
-            link_cell.hyperlink = f"#{workspace_lookup[store['workspace_name']]}"
-            link_cell.style = "Hyperlink"
+        workspace_link = workspace_lookup.get(store['workspace_name'])
+        rows.append([
+            make_cell(ws_stores, store['workspace_name'], f"#{workspace_link}" if workspace_link else None),
+            make_cell(ws_stores, store['store_name']),
+            make_cell(ws_stores, store['store_url'])
+        ])
     
-    format_worksheet(ws_stores)
-    adjust_column_width(ws_stores)
-    apply_na_color(ws_stores)
+    write_rows(ws_stores, rows)
     print("Stores worksheet completed.")
 
     # Groups sheet with 'CRS' and other details included
     ws_groups = wb.create_sheet(title="Layer Groups", index=2)
-    ws_groups.append(["Group Name", "Title", "CRS", "Bounds", "Mode", "Layers"])
-    
-    group_worksheets = {}
+    rows = [make_row(ws_groups, ["Group Name", "Title", "CRS", "Bounds", "Mode", "Layers"])]
     
     for group in groups:
-        ws_groups.append([group['group_name'], group['title'], group['crs'], group['bounds'], group['mode'], group['layers']])
-        
-        # Store the reference for hyperlinks
-        group_worksheets[group['group_name']] = f"Group {group['group_name'][:25]}"
-
-    format_worksheet(ws_groups)
-    adjust_column_width(ws_groups)
-    apply_na_color(ws_groups)
-    
-    # Add hyperlinks to 'Group Name' column in 'Layer Groups'
-    for idx, group_name in enumerate(group_worksheets.keys(), start=2):
-        cell = ws_groups.cell(row=idx, column=1)
-        # Use group name within single quotes and parentheses
-        cell.hyperlink = f"#'Group {group_name[:25]}'!A1"
-        cell.style = "Hyperlink"
+        # Add hyperlink to 'Group Name' column, using group name within single quotes and parentheses
+        group_link = f"#'Group {group['group_name'][:25]}'!A1"
+        rows.append([make_cell(ws_groups, group['group_name'], group_link)] + make_row(ws_groups, [group['title'], group['crs'], group['bounds'], group['mode'], group['layers']]))
 
     # Add hyperlink to the 'Layers' header in 'Layer Groups'
-    add_header_hyperlinks_layer_groups(ws_groups)
+    add_header_hyperlinks_layer_groups(rows[0])
 
+    write_rows(ws_groups, rows)
     print("Layer Groups worksheet completed.")
 
     # Layers sheet (added after 'Layer Groups')
     ws_layers = wb.create_sheet(title="Layers", index=3)
-    ws_layers.append(["Workspace Name", "Store Name", "Group Name", "Layer Name", "Child title", "Default style", "Available styles", "CRS", "Bounding Box", "Abstract"])
+    rows = [make_row(ws_layers, ["Workspace Name", "Store Name", "Group Name", "Layer Name", "Child title", "Default style", "Available styles", "CRS", "Bounding Box", "Abstract"])]
     
+    # Layer rows carry no hyperlinks, so they are kept as plain values: the write-only
+    # serializer then streams them through a single reused cell instead of one object per value
     for layer in layers:
-        ws_layers.append([layer['workspace_name'], layer['store'], layer['group_name'], layer['name'], layer['title'], layer['default_style'], layer['available_styles'], layer['crs'], str(layer['bbox']), layer['abstract']])
+        rows.append(make_plain_row(ws_layers, [layer['workspace_name'], layer['store'], layer['group_name'], layer['name'], layer['title'], layer['default_style'], layer['available_styles'], layer['crs'], layer['bbox'], layer['abstract']]))
 
     # Add header hyperlinks to 'Layers' sheet
-    add_header_hyperlinks_layers(ws_layers)
+    add_header_hyperlinks_layers(rows[0])
 
-    format_worksheet(ws_layers)
-    adjust_column_width(ws_layers)
-    apply_na_color(ws_layers)
+    write_rows(ws_layers, rows)
     print("Layers worksheet completed.")
 
     # Styles sheet (added right after 'Layers')
     ws_styles = wb.create_sheet(title="Styles", index=4)
-    ws_styles.append(["Style name", "Style link"])
+    rows = [make_row(ws_styles, ["Style name", "Style link"])]
     
     for style in styles:
         style_name = style.get("name", "N/A")
         style_link = f"https://csg-geoserver.university.innopolis.ru/geoserver/rest/workspaces/cgs/styles/{style_name}.html"
         sld_link = f"https://csg-geoserver.university.innopolis.ru/geoserver/rest/workspaces/cgs/styles/{style_name}.sld"
         
-        style_name_cell = ws_styles.cell(row=ws_styles.max_row + 1, column=1)
-        style_name_cell.value = style_name
-        style_name_cell.hyperlink = sld_link
-        style_name_cell.style = "Hyperlink"
-        
-        style_link_cell = ws_styles.cell(row=ws_styles.max_row, column=2)
-        style_link_cell.value = style_link
-        style_link_cell.hyperlink = style_link  # Add hyperlink using the cell value
+        row = [make_cell(ws_styles, style_name, sld_link), make_cell(ws_styles, style_link)]
+        row[1].hyperlink = style_link  # Add hyperlink using the cell value
+        rows.append(row)
     
-    format_worksheet(ws_styles)
-    adjust_column_width(ws_styles)
-    apply_na_color(ws_styles)
+    write_rows(ws_styles, rows)
     print("Styles worksheet completed.")
 
     # Create worksheets for each layer group
-    create_group_worksheets(wb, groups, layers)
+    create_group_worksheets(wb, groups, layers, lookups)
 
     # Set 'Layer Groups' as the default active sheet
     wb.active = wb["Layer Groups"]
@@ -478,12 +574,19 @@ def generate_filename():
     return f"geoserver_data_{timestamp}.xlsx"
 
 if __name__ == "__main__":
-    # Fetch detailed information
-    workspaces = fetch_workspace_details()
-    stores = fetch_store_details()  # Fetch store details
-    groups, group_to_layers = fetch_group_details()  # Fetch group details and map layers to groups
-    layers = fetch_layer_details(group_to_layers)  # Fetch layer details and associate them with groups
-    styles = fetch_styles()  # Fetch styles for the Styles worksheet
+    # Fetch the independent catalog sections concurrently
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        workspaces_future = executor.submit(fetch_workspace_details)
+        stores_future = executor.submit(fetch_store_details)  # Fetch store details
+        groups_future = executor.submit(fetch_group_details)  # Fetch group details and map layers to groups
+        styles_future = executor.submit(fetch_styles)  # Fetch styles for the Styles worksheet
+
+        workspaces = workspaces_future.result()
+        stores = stores_future.result()
+        groups, group_to_layers = groups_future.result()
+        styles = styles_future.result()
+
+    layers = fetch_layer_details(group_to_layers)  # Fetch layer details and associate them with groups (needs the groups first)
 
     # Generate dynamic filename
     output_filename = generate_filename()